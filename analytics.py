@@ -0,0 +1,262 @@
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import case, func, or_, select, union_all
+from models import db, User, Product, Bid, ArchivedProduct, ArchivedBid
+
+# strftime formats used to bucket bids by time (SQLite)
+BUCKET_FORMATS = {
+    'minute': '%Y-%m-%dT%H:%M:00',
+    'hour': '%Y-%m-%dT%H:00:00',
+    'day': '%Y-%m-%d',
+}
+
+TOP_BIDDERS_LIMIT = 10
+
+# Closed auctions refuse new bids (see BiddingResource.post), so their bid
+# aggregates are cached. The key includes the end time and the last bid id, so
+# editing the product or any bid written around the API gets a fresh entry.
+# Only the aggregates are cached, never product fields such as the name. The
+# cache is bounded by the total number of price curve rows it holds, oldest
+# entries evicted first.
+CLOSED_CACHE_MAX_ROWS = 100000
+_closed_product_cache = OrderedDict()
+_closed_product_cache_rows = 0
+
+
+def is_closed(product, now=None):
+    now = now or datetime.utcnow()
+    return product.status != 'available' or product.bidding_end_time <= now
+
+
+def _user_bid_source(include_archived):
+    if not include_archived:
+        return Bid.__table__
+    columns = ['id', 'user_id', 'product_id', 'amount', 'bidding_time']
+    return union_all(
+        select(*[Bid.__table__.c[name] for name in columns]),
+        select(*[ArchivedBid.__table__.c[name] for name in columns]),
+    ).subquery('all_bids')
+
+
+def _closed_product_source(include_archived, now=None):
+    now = now or datetime.utcnow()
+    closed = select(Product.id).where(
+        or_(Product.status == 'sold', Product.bidding_end_time <= now)
+    )
+    if not include_archived:
+        return closed.subquery('closed_products')
+    # Archived auctions are always closed
+    return union_all(closed, select(ArchivedProduct.id)).subquery('closed_products')
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _product_summary(bids, product_id):
+    row = db.session.execute(
+        select(
+            func.count(bids.c.id).label('bid_count'),
+            func.count(bids.c.user_id.distinct()).label('bidder_count'),
+            func.min(bids.c.amount).label('min_amount'),
+            func.max(bids.c.amount).label('max_amount'),
+            func.avg(bids.c.amount).label('avg_amount'),
+            func.min(bids.c.bidding_time).label('first_bid'),
+            func.max(bids.c.bidding_time).label('last_bid'),
+            ((func.julianday(func.max(bids.c.bidding_time)) - func.julianday(func.min(bids.c.bidding_time))) * 24).label('span_hours'),
+        ).where(bids.c.product_id == product_id)
+    ).one()
+
+    span_hours = row.span_hours or 0
+    return {
+        'bid_count': row.bid_count,
+        'bidder_count': row.bidder_count,
+        'min_amount': row.min_amount,
+        'max_amount': row.max_amount,
+        'avg_amount': row.avg_amount,
+        'first_bid': _isoformat(row.first_bid),
+        'last_bid': _isoformat(row.last_bid),
+        'bids_per_hour': row.bid_count / span_hours if span_hours else None,
+    }
+
+
+def _price_curve(bids, product_id, bucket):
+    # GROUP BY time bucket, then window functions over the buckets for the
+    # running high bid and the cumulative bid count.
+    bucket_col = func.strftime(BUCKET_FORMATS[bucket], bids.c.bidding_time).label('bucket')
+    per_bucket = select(
+        bucket_col,
+        func.count(bids.c.id).label('bid_count'),
+        func.min(bids.c.amount).label('min_amount'),
+        func.max(bids.c.amount).label('max_amount'),
+        func.avg(bids.c.amount).label('avg_amount'),
+    ).where(bids.c.product_id == product_id).group_by(bucket_col).subquery()
+
+    rows = db.session.execute(
+        select(
+            per_bucket,
+            func.max(per_bucket.c.max_amount).over(order_by=per_bucket.c.bucket).label('running_high'),
+            func.sum(per_bucket.c.bid_count).over(order_by=per_bucket.c.bucket).label('cumulative_bids'),
+        ).order_by(per_bucket.c.bucket)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def _bidder_concentration(bids, product_id):
+    per_bidder = select(
+        bids.c.user_id,
+        func.count(bids.c.id).label('bid_count'),
+        func.max(bids.c.amount).label('max_amount'),
+    ).where(bids.c.product_id == product_id).group_by(bids.c.user_id).subquery()
+
+    # Herfindahl-Hirschman index over each bidder's share of the bids:
+    # 1.0 means a single bidder, values near 0 mean widely spread bidding.
+    totals = db.session.execute(
+        select(
+            func.sum(per_bidder.c.bid_count).label('total'),
+            func.sum(per_bidder.c.bid_count * per_bidder.c.bid_count).label('sum_squares'),
+        )
+    ).one()
+
+    top_bidders = db.session.execute(
+        select(per_bidder, User.username)
+        .join(User, User.id == per_bidder.c.user_id)
+        .order_by(per_bidder.c.bid_count.desc(), per_bidder.c.max_amount.desc())
+        .limit(TOP_BIDDERS_LIMIT)
+    )
+
+    total = totals.total or 0
+    return {
+        'hhi': totals.sum_squares / (total * total) if total else None,
+        'top_bidders': [
+            dict(row._mapping, share=row.bid_count / total)
+            for row in top_bidders
+        ],
+    }
+
+
+def _cache_closed_product(key, aggregates):
+    global _closed_product_cache_rows
+    rows = len(aggregates['price_curve'])
+    if rows > CLOSED_CACHE_MAX_ROWS:
+        return
+    _closed_product_cache[key] = aggregates
+    _closed_product_cache_rows += rows
+    while _closed_product_cache_rows > CLOSED_CACHE_MAX_ROWS:
+        _, evicted = _closed_product_cache.popitem(last=False)
+        _closed_product_cache_rows -= len(evicted['price_curve'])
+
+
+def clear_cache():
+    global _closed_product_cache_rows
+    _closed_product_cache.clear()
+    _closed_product_cache_rows = 0
+
+
+def product_analytics(product, bucket='hour'):
+    # Archived products are looked up against the archived bids
+    bids = ArchivedBid.__table__ if isinstance(product, ArchivedProduct) else Bid.__table__
+    closed = is_closed(product)
+    aggregates = None
+    if closed:
+        last_bid_id = db.session.scalar(select(func.max(bids.c.id)).where(bids.c.product_id == product.id))
+        key = (bids.name, product.id, product.bidding_end_time, last_bid_id, bucket)
+        aggregates = _closed_product_cache.get(key)
+        if aggregates is not None:
+            _closed_product_cache.move_to_end(key)
+
+    if aggregates is None:
+        aggregates = {
+            'summary': _product_summary(bids, product.id),
+            'price_curve': _price_curve(bids, product.id, bucket),
+            'concentration': _bidder_concentration(bids, product.id),
+        }
+        if closed:
+            _cache_closed_product(key, aggregates)
+
+    return {
+        'product_id': product.id,
+        'product_name': product.name,
+        'closed': closed,
+        'bucket': bucket,
+        **aggregates,
+    }
+
+
+def _user_summary(bids, user_id):
+    row = db.session.execute(
+        select(
+            func.count(bids.c.id).label('bid_count'),
+            func.count(bids.c.product_id.distinct()).label('product_count'),
+            func.sum(bids.c.amount).label('total_amount'),
+            func.avg(bids.c.amount).label('avg_amount'),
+            func.max(bids.c.amount).label('max_amount'),
+            func.min(bids.c.bidding_time).label('first_bid'),
+            func.max(bids.c.bidding_time).label('last_bid'),
+        ).where(bids.c.user_id == user_id)
+    ).one()
+
+    return {
+        'bid_count': row.bid_count,
+        'product_count': row.product_count,
+        'total_amount': row.total_amount,
+        'avg_amount': row.avg_amount,
+        'max_amount': row.max_amount,
+        'first_bid': _isoformat(row.first_bid),
+        'last_bid': _isoformat(row.last_bid),
+    }
+
+
+def _user_wins(bids, closed_products, user_id):
+    # Rank every bid on the closed auctions this user took part in; the
+    # highest (earliest on ties) bid per product is the winner.
+    participated = select(bids.c.product_id).where(bids.c.user_id == user_id).distinct().subquery()
+    closed = select(closed_products.c.id).join(
+        participated, participated.c.product_id == closed_products.c.id
+    ).subquery()
+    ranked = select(
+        bids.c.user_id,
+        func.row_number().over(
+            partition_by=bids.c.product_id,
+            order_by=(bids.c.amount.desc(), bids.c.bidding_time, bids.c.id),
+        ).label('rank'),
+    ).join(closed, closed.c.id == bids.c.product_id).subquery()
+
+    row = db.session.execute(
+        select(
+            func.count().label('closed_auctions'),
+            func.coalesce(func.sum(case((ranked.c.user_id == user_id, 1), else_=0)), 0).label('wins'),
+        ).where(ranked.c.rank == 1)
+    ).one()
+
+    return {
+        'closed_auctions': row.closed_auctions,
+        'wins': row.wins,
+        'win_rate': row.wins / row.closed_auctions if row.closed_auctions else None,
+    }
+
+
+def _user_activity(bids, user_id, bucket):
+    bucket_col = func.strftime(BUCKET_FORMATS[bucket], bids.c.bidding_time).label('bucket')
+    rows = db.session.execute(
+        select(
+            bucket_col,
+            func.count(bids.c.id).label('bid_count'),
+            func.count(bids.c.product_id.distinct()).label('product_count'),
+            func.sum(bids.c.amount).label('total_amount'),
+        ).where(bids.c.user_id == user_id).group_by(bucket_col).order_by(bucket_col)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def user_analytics(user, bucket='day', include_archived=False):
+    bids = _user_bid_source(include_archived)
+    return {
+        'user_id': user.id,
+        'username': user.username,
+        'bucket': bucket,
+        'include_archived': include_archived,
+        'summary': _user_summary(bids, user.id),
+        'wins': _user_wins(bids, _closed_product_source(include_archived), user.id),
+        'activity': _user_activity(bids, user.id, bucket),
+    }
@@ -1,22 +1,27 @@
+import os
 import random
+import click
 from flask import Flask, request, jsonify, make_response, session, redirect, url_for, render_template
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_restful import Api, Resource
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from werkzeug.exceptions import NotFound
+from werkzeug.exceptions import BadRequest, NotFound
+from sqlalchemy.orm import joinedload
 from datetime import timedelta, datetime
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
 app.config["JWT_SECRET_KEY"] = "fsbdgfnhgvjnvhmvh" + str(random.randint(1, 1000000000000))
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(days=1)
 app.config["SECRET_KEY"] = "JKSRVHJVFBSRDFV" + str(random.randint(1, 1000000000000))
 app.json.compact = False
 api = Api(app)
 
-from models import db, User, Product, Bid
+from models import db, User, Product, Bid, ArchivedProduct, ArchivedBid
+from analytics import BUCKET_FORMATS, is_closed, product_analytics, user_analytics
+from archive import archive_settled_auctions
 
 db.init_app(app)
 jwt = JWTManager(app)
@@ -47,6 +52,37 @@ def handle_not_found(e):
 
 app.register_error_handler(404, handle_not_found)
 
+# Read endpoints only look at the archive when asked with ?include_archived=true
+def include_archived():
+    return request.args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# The archive holds the full history, so list endpoints that include it are
+# always paged. Live and archived ids never overlap, so one id cursor pages
+# through both: ?limit rows with id greater than ?after_id, and the cursor
+# for the next page in the X-Next-After-Id header.
+def paging_requested():
+    return include_archived() or 'limit' in request.args or 'after_id' in request.args
+
+def page_rows(sources):
+    try:
+        limit = int(request.args.get('limit', PAGE_SIZE))
+        after_id = int(request.args.get('after_id', 0))
+    except ValueError:
+        raise BadRequest("limit and after_id must be integers")
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise BadRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    rows = []
+    for query, model in sources:
+        rows += query.filter(model.id > after_id).order_by(model.id).limit(limit).all()
+    rows = sorted(rows, key=lambda row: row.id)[:limit]
+
+    headers = {'X-Next-After-Id': str(rows[-1].id)} if len(rows) == limit else {}
+    return rows, headers
+
 
 
 class UserResource(Resource):
@@ -83,8 +119,15 @@ class UserResource(Resource):
 class BiddingResource(Resource):
     @role_required(['customer'])  # Only customer can bid on products
     def get(self):
-        bids = Bid.query.all()
-        return [bid.to_dict() for bid in bids], 200
+        if not paging_requested():
+            bids = Bid.query.all()
+            return [bid.to_dict() for bid in bids], 200
+
+        sources = [(Bid.query.options(joinedload(Bid.user), joinedload(Bid.product)), Bid)]
+        if include_archived():
+            sources.append((ArchivedBid.query.options(joinedload(ArchivedBid.user), joinedload(ArchivedBid.product)), ArchivedBid))
+        bids, headers = page_rows(sources)
+        return [bid.to_dict() for bid in bids], 200, headers
 
     @role_required(['customer'])  # Only customers can post bids
     def post(self):
@@ -95,9 +138,9 @@ class BiddingResource(Resource):
         bidding_time=data.get('bidding_time')
         highest_bid=data.get('highest_bid')
 
-        # Validate if the product exists and is available
+        # Validate if the product exists and is still open for bidding
         product = Product.query.get(product_id)
-        if not product or product.status != 'available':
+        if not product or is_closed(product):
             return {"message": "Product not available for bidding."}, 400
 
         bid = Bid(user_id=user_id, product_id=product_id, amount=amount, bidding_time=bidding_time, highest_bid=highest_bid)
@@ -146,16 +189,29 @@ class ProductResource(Resource):
     def get(self, product_id=None):
         if product_id:
             product = Product.query.get(product_id)
+            if not product and include_archived():
+                product = ArchivedProduct.query.get(product_id)
             if not product:
                 return {"message": "Product not found"}, 404
             return product.to_dict(), 200
 
         status = request.args.get('status')
         query = Product.query
+        archived_query = ArchivedProduct.query
         if status:
             query = query.filter_by(status=status)
+            archived_query = archived_query.filter_by(status=status)
+        if not paging_requested():
             products = query.all()
-        return jsonify([product.to_dict() for product in products])
+            return jsonify([product.to_dict() for product in products])
+
+        sources = [(query, Product)]
+        if include_archived():
+            sources.append((archived_query, ArchivedProduct))
+        products, headers = page_rows(sources)
+        response = jsonify([product.to_dict() for product in products])
+        response.headers.extend(headers)
+        return response
 
     @jwt_required()
     @role_required(['admin'])  # Only admins can update products
@@ -209,6 +265,34 @@ class ProductResource(Resource):
         db.session.commit()
         return {"message": "Product deleted successfully"}, 200
 
+class ProductAnalyticsResource(Resource):
+    @role_required(['admin'])  # Only admins can view analytics
+    def get(self, product_id):
+        product = Product.query.get(product_id)
+        if not product and include_archived():
+            product = ArchivedProduct.query.get(product_id)
+        if not product:
+            return {"message": "Product not found"}, 404
+
+        bucket = request.args.get('bucket', 'hour')
+        if bucket not in BUCKET_FORMATS:
+            return {"message": f"Invalid bucket. Must be one of {list(BUCKET_FORMATS)}"}, 400
+
+        return product_analytics(product, bucket), 200
+
+class UserAnalyticsResource(Resource):
+    @role_required(['admin'])  # Only admins can view analytics
+    def get(self, user_id):
+        user = User.query.get(user_id)
+        if not user:
+            return {'error': 'User not found'}, 404
+
+        bucket = request.args.get('bucket', 'day')
+        if bucket not in BUCKET_FORMATS:
+            return {"message": f"Invalid bucket. Must be one of {list(BUCKET_FORMATS)}"}, 400
+
+        return user_analytics(user, bucket, include_archived()), 200
+
 #    login resource
 class Login(Resource):
     def post(self):
@@ -274,10 +358,29 @@ class Logout(Resource):
 api.add_resource(UserResource, '/users', '/users/<int:user_id>')
 api.add_resource(ProductResource, '/products', '/products/<int:product_id>')
 api.add_resource(BiddingResource, '/bids')
+api.add_resource(ProductAnalyticsResource, '/analytics/products/<int:product_id>')
+api.add_resource(UserAnalyticsResource, '/analytics/users/<int:user_id>')
 api.add_resource(Login, '/login')
 api.add_resource(Register, '/register')
 api.add_resource(CheckSession, '/session')
 api.add_resource(Logout, '/logout')
 
+# Move settled auctions and their bids into the archive tables
+@app.cli.command('archive-auctions')
+@click.option('--batch-size', default=200, help='Products archived per transaction.')
+@click.option('--pause', default=0.1, help='Seconds to sleep between batches.')
+@click.option('--grace-days', default=7, help='Days an auction must have been closed.')
+@click.option('--max-batches', default=None, type=int, help='Stop after this many batches.')
+@click.option('--bid-batch-size', default=5000, help='Bids archived per transaction.')
+def archive_auctions(batch_size, pause, grace_days, max_batches, bid_batch_size):
+    archived = archive_settled_auctions(
+        batch_size=batch_size,
+        bid_batch_size=bid_batch_size,
+        pause=pause,
+        grace_period=timedelta(days=grace_days),
+        max_batches=max_batches,
+    )
+    click.echo(f"Archived {archived} products")
+
 if __name__ == '__main__':
     app.run(port=5555, debug=True)
\ No newline at end of file
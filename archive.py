@@ -0,0 +1,94 @@
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, literal, select
+from models import db, Product, Bid, ArchivedProduct, ArchivedBid
+
+# Auctions are only archived once bidding has been over for this long, sold
+# or not, so late settlement (accepting/rejecting bids) still happens on live
+# rows.
+ARCHIVE_GRACE_PERIOD = timedelta(days=7)
+
+# Most bids moved in one transaction
+BID_BATCH_SIZE = 5000
+
+PRODUCT_COLUMNS = ['id', 'name', 'description', 'price_tag', 'quantity', 'status', 'user_id', 'bidding_end_time']
+BID_COLUMNS = ['id', 'user_id', 'product_id', 'amount', 'status', 'bidding_time', 'highest_bid']
+
+
+def settled_products(grace_period=ARCHIVE_GRACE_PERIOD, now=None):
+    cutoff = (now or datetime.utcnow()) - grace_period
+    return select(Product.id).where(Product.bidding_end_time <= cutoff)
+
+
+def _copy_products(product_ids, now, replace=False):
+    product_table = Product.__table__
+    # Ignore rows already copied by an interrupted run; the final copy
+    # replaces them with the latest live values.
+    statement = insert(ArchivedProduct.__table__).prefix_with('OR REPLACE' if replace else 'OR IGNORE')
+    db.session.execute(
+        statement.from_select(
+            PRODUCT_COLUMNS + ['archived_at'],
+            select(
+                *[product_table.c[name] for name in PRODUCT_COLUMNS],
+                literal(now, db.DateTime),
+            ).where(product_table.c.id.in_(product_ids)),
+        )
+    )
+
+
+def archive_products(product_ids, bid_batch_size=BID_BATCH_SIZE, pause=0, now=None):
+    # A single auction can have thousands of bids, so they are moved in their
+    # own bounded transactions between copying the products and deleting them.
+    now = now or datetime.utcnow()
+    bid_table = Bid.__table__
+
+    _copy_products(product_ids, now)
+    db.session.commit()
+
+    # Newest bids first, so a product's last live bid id (part of the
+    # analytics cache key) changes with every batch moved
+    while True:
+        bid_ids = db.session.scalars(
+            select(bid_table.c.id)
+            .where(bid_table.c.product_id.in_(product_ids))
+            .order_by(bid_table.c.id.desc())
+            .limit(bid_batch_size)
+        ).all()
+        if not bid_ids:
+            break
+
+        db.session.execute(
+            insert(ArchivedBid.__table__).from_select(
+                BID_COLUMNS,
+                select(*[bid_table.c[name] for name in BID_COLUMNS])
+                .where(bid_table.c.id.in_(bid_ids)),
+            )
+        )
+        db.session.execute(delete(bid_table).where(bid_table.c.id.in_(bid_ids)))
+        db.session.commit()
+        time.sleep(pause)
+
+    _copy_products(product_ids, now, replace=True)
+    db.session.execute(delete(Product.__table__).where(Product.__table__.c.id.in_(product_ids)))
+    db.session.commit()
+
+
+def archive_settled_auctions(batch_size=200, pause=0.1, grace_period=ARCHIVE_GRACE_PERIOD, max_batches=None,
+                             bid_batch_size=BID_BATCH_SIZE):
+    # Archive in small batches, sleeping between them, so the write lock is
+    # only held briefly and live bidding is not stalled. No transaction moves
+    # more than batch_size products or bid_batch_size bids.
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        product_ids = db.session.scalars(
+            settled_products(grace_period).order_by(Product.id).limit(batch_size)
+        ).all()
+        if not product_ids:
+            break
+
+        archive_products(product_ids, bid_batch_size=bid_batch_size, pause=pause)
+        archived += len(product_ids)
+        batches += 1
+        time.sleep(pause)
+    return archived
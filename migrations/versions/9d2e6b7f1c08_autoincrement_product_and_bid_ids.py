@@ -0,0 +1,40 @@
+"""autoincrement product and bid ids
+
+Revision ID: 9d2e6b7f1c08
+Revises: 7c51e0b4a2d3
+Create Date: 2026-10-20 10:05:51.342177
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2e6b7f1c08'
+down_revision = '7c51e0b4a2d3'
+branch_labels = None
+depends_on = None
+
+# live table -> archive table holding rows moved out of it
+ARCHIVED_TABLES = [('product', 'product_archive'), ('bids', 'bids_archive')]
+
+
+def upgrade():
+    # SQLite can only add AUTOINCREMENT by rebuilding the table
+    for table, _ in ARCHIVED_TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+            pass
+
+    # Start the sequences past every id already used, including archived ones
+    for table, archive in ARCHIVED_TABLES:
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', "
+            f"MAX(COALESCE((SELECT MAX(id) FROM {table}), 0), COALESCE((SELECT MAX(id) FROM {archive}), 0))"
+        )
+
+
+def downgrade():
+    for table, _ in ARCHIVED_TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+            pass
@@ -77,6 +77,8 @@ class User(db.Model, SerializerMixin):
 # product model
 class Product(db.Model, SerializerMixin):
     __tablename__ = 'product'
+    # AUTOINCREMENT so ids moved to product_archive are never handed out again
+    __table_args__ = {'sqlite_autoincrement': True}
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -138,6 +140,13 @@ class Product(db.Model, SerializerMixin):
 
 class Bid(db.Model):
     __tablename__ = 'bids'
+    # Analytics aggregate bids per product over time and per user.
+    # AUTOINCREMENT so ids moved to bids_archive are never handed out again.
+    __table_args__ = (
+        db.Index('ix_bids_product_id_bidding_time', 'product_id', 'bidding_time'),
+        db.Index('ix_bids_user_id_product_id', 'user_id', 'product_id'),
+        {'sqlite_autoincrement': True},
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -186,4 +195,73 @@ class Bid(db.Model):
             'status': self.status,
             'bidding_time': self.bidding_time.isoformat(),
             'highest_bid':self.highest_bid
-        }
\ No newline at end of file
+        }
+
+# Settled auctions are moved out of the live product/bids tables into these
+# archive tables (see archive.py). Ids are kept so archived rows can still be
+# looked up by their original id.
+class ArchivedProduct(db.Model):
+    __tablename__ = 'product_archive'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    price_tag = db.Column(db.Float, nullable=False)
+    quantity = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.String(20), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    bidding_end_time = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ArchivedProduct {self.name}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'price_tag': self.price_tag,
+            'quantity': self.quantity,
+            'status': self.status,
+            'user_id': self.user_id,
+            'bidding_end_time': self.bidding_end_time.isoformat(),
+            'archived_at': self.archived_at.isoformat(),
+            'archived': True
+        }
+
+
+class ArchivedBid(db.Model):
+    __tablename__ = 'bids_archive'
+    __table_args__ = (
+        db.Index('ix_bids_archive_product_id_bidding_time', 'product_id', 'bidding_time'),
+        db.Index('ix_bids_archive_user_id_product_id', 'user_id', 'product_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('product_archive.id'), nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    bidding_time = db.Column(db.DateTime, nullable=False)
+    highest_bid = db.Column(db.Float, nullable=False)
+
+    user = db.relationship('User', lazy=True)
+    product = db.relationship('ArchivedProduct', backref='bids', lazy=True)
+
+    def __repr__(self):
+        return f'<ArchivedBid {self.id} by User {self.user_id} for Product {self.product_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'user': self.user.username if self.user else 'Unknown',
+            'product_id': self.product_id,
+            'product_name': self.product.name if self.product else 'Unknown',
+            'amount': self.amount,
+            'status': self.status,
+            'bidding_time': self.bidding_time.isoformat(),
+            'highest_bid': self.highest_bid,
+            'archived': True
+        }
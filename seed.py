@@ -1,8 +1,206 @@
+import argparse
+import hashlib
+import math
+import random
+import string
+from datetime import datetime, timedelta
+from sqlalchemy import insert
 from app import app
 from models import db, User, Product, Bid
-from datetime import datetime
 
-def seed_data():
+CHUNK_SIZE = 50000
+
+# Relaxed durability for the duration of the load; the database is rebuilt
+# from scratch, so a crash mid-seed only means running the seeder again.
+LOAD_PRAGMAS = [
+    'PRAGMA journal_mode=MEMORY',
+    'PRAGMA synchronous=OFF',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',
+]
+RESTORE_PRAGMAS = [
+    'PRAGMA journal_mode=DELETE',
+    'PRAGMA synchronous=FULL',
+    'PRAGMA temp_store=DEFAULT',
+]
+
+PRODUCT_NAMES = [
+    'Gear Box', 'Steering Wheel', 'Tyres', 'Brake Pads', 'Headlights',
+    'Side Mirror', 'Radiator', 'Alternator', 'Spark Plugs', 'Exhaust Pipe',
+]
+
+# Fixed sample accounts so there is always a known customer and admin to log in with
+SAMPLE_USERS = [
+    {'username': 'johndoe', 'email': 'johndoe@example.com', 'password': 'password123', 'role': 'customer'},
+    {'username': 'scholar', 'email': 'scholar@example.com', 'password': 'scholarpass', 'role': 'admin'},
+]
+SYNTHETIC_PASSWORD = 'password123'
+PBKDF2_ITERATIONS = 600000
+SALT_CHARS = string.ascii_letters + string.digits
+
+# Auction end times and bid times are laid out relative to an anchor date:
+# six months of closed auctions before it and a month of open ones after it.
+# The same --seed and --anchor always rebuild the same database.
+
+
+def chunked(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bulk_insert(conn, table, rows):
+    # Core executemany, one transaction per chunk
+    count = 0
+    for chunk in chunked(rows):
+        conn.execute(insert(table), chunk)
+        conn.commit()
+        count += len(chunk)
+    return count
+
+
+def hash_password(rng, password):
+    # Same format as werkzeug's generate_password_hash('pbkdf2'), so
+    # User.check_password accepts it, but salted from the seeded generator so
+    # the user table is reproducible too
+    salt = ''.join(rng.choice(SALT_CHARS) for _ in range(16))
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), PBKDF2_ITERATIONS).hex()
+    return f'pbkdf2:sha256:{PBKDF2_ITERATIONS}${salt}${digest}'
+
+
+def generate_users(rng, num_users):
+    # Hash each distinct password once; every synthetic user shares the hash
+    hashes = {}
+    for user in SAMPLE_USERS + [{'password': SYNTHETIC_PASSWORD}]:
+        if user['password'] not in hashes:
+            hashes[user['password']] = hash_password(rng, user['password'])
+
+    for user in SAMPLE_USERS:
+        yield {
+            'username': user['username'],
+            'email': user['email'],
+            '_password_hash': hashes[user['password']],
+            'role': user['role'],
+        }
+    for i in range(1, num_users + 1):
+        yield {
+            'username': f'user{i}',
+            'email': f'user{i}@example.com',
+            '_password_hash': hashes[SYNTHETIC_PASSWORD],
+            'role': 'customer',
+        }
+
+
+def generate_products(rng, num_products, admin_ids, now):
+    # Bidding end times spread from six months ago to a month ahead, so the
+    # dataset has a mix of closed and live auctions.
+    products = []
+    for i in range(1, num_products + 1):
+        name = rng.choice(PRODUCT_NAMES)
+        products.append({
+            'id': i,
+            'name': f'{name} {i}',
+            'description': f'{name} listed for auction',
+            'price_tag': round(rng.lognormvariate(8, 0.8), 2),
+            'quantity': rng.randint(1, 100),
+            'status': 'available',
+            'user_id': rng.choice(admin_ids),
+            'bidding_end_time': now + timedelta(days=rng.uniform(-180, 30)),
+        })
+    return products
+
+
+def allocate_bids(rng, num_bids, num_products):
+    # Skewed split: most auctions get a modest number of bids, a few get many more
+    weights = [rng.lognormvariate(0, 1.2) for _ in range(num_products)]
+    total = sum(weights)
+    counts = [int(num_bids * weight / total) for weight in weights]
+    for index in rng.choices(range(num_products), weights=weights, k=num_bids - sum(counts)):
+        counts[index] += 1
+    return counts
+
+
+def generate_product_bids(rng, product, num_bids, customer_ids, now):
+    closed = product['bidding_end_time'] <= now
+    window_end = min(product['bidding_end_time'], now)
+    duration = timedelta(days=rng.uniform(1, 14)).total_seconds()
+
+    # Bidding picks up towards the end of an auction
+    offsets = sorted(duration * math.sqrt(rng.random()) for _ in range(num_bids))
+    window_start = window_end - timedelta(seconds=duration)
+
+    # Each auction draws from its own pool of bidders, a few of whom place
+    # most of the bids (Zipf-like weights). Busier auctions draw more bidders.
+    min_pool = max(2, int(math.sqrt(num_bids)))
+    pool_size = min(len(customer_ids), max(min_pool, int(rng.paretovariate(1.1) * 3)))
+    pool = rng.sample(customer_ids, pool_size)
+    cum_weights = []
+    running = 0
+    for rank in range(pool_size):
+        running += 1 / (rank + 1)
+        cum_weights.append(running)
+    bidders = rng.choices(pool, cum_weights=cum_weights, k=num_bids)
+
+    # Bidding opens below the price tag and climbs towards what the item is
+    # worth to bidders; increments shrink as the high bid nears that value.
+    price = product['price_tag']
+    valuation = price * rng.lognormvariate(0.1, 0.25)
+    highest = min(price * rng.uniform(0.5, 0.9), valuation * 0.9)
+    winner = None
+    bids = []
+    for offset, user_id in zip(offsets, bidders):
+        if rng.random() < 0.85:
+            amount = min(highest + (valuation - highest) * rng.uniform(0.02, 0.2) + price * 0.001, valuation)
+        else:
+            amount = highest * rng.uniform(0.9, 1.0)
+        amount = round(amount, 2)
+        if winner is None or amount > highest:
+            highest = amount
+            winner = len(bids)
+        bids.append({
+            'user_id': user_id,
+            'product_id': product['id'],
+            'amount': amount,
+            'status': 'pending',
+            'bidding_time': window_start + timedelta(seconds=offset),
+            'highest_bid': highest,
+        })
+
+    if closed and bids:
+        for index, bid in enumerate(bids):
+            bid['status'] = 'accepted' if index == winner else 'rejected'
+        product['status'] = 'sold'
+    return bids
+
+
+def generate_bids(rng, products, counts, customer_ids, now):
+    for product, num_bids in zip(products, counts):
+        if num_bids:
+            yield from generate_product_bids(rng, product, num_bids, customer_ids, now)
+
+
+def today():
+    return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def parse_anchor(value):
+    if value == 'today':
+        return today()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid anchor {value!r}. Use YYYY-MM-DD or 'today'")
+
+
+def seed_data(num_users=50, num_products=20, num_bids=1000, seed=42, anchor=None):
+    rng = random.Random(seed)
+    now = anchor or today()
+
     with app.app_context():
         # Drop existing tables and create new ones
         db.drop_all()
@@ -11,57 +209,63 @@ def seed_data():
         # Clear session
         db.session.remove()
 
-        # Sample users with passwords and roles (writer, admin, client)
-        users = [
-            {'username': 'johndoe', 'email': 'johndoe@example.com', 'password': 'password123', 'role': 'customer'},
-            {'username': 'scholar', 'email': 'scholar@example.com', 'password': 'scholarpass', 'role': 'admin'}
-        ]
-
-        # Add users to the session
-        for user_data in users:
-            user = User(username=user_data['username'], email=user_data['email'], role=user_data['role'])
-            user.set_password(user_data['password'])  
-            db.session.add(user)
-
-        db.session.commit()
-
-        # Sample products
-        products = [
-            Product(
-                name='Gear Box', description=' Sparkling new', price_tag=2000.00, 
-                quantity=12, bidding_end_time=datetime(2024, 8, 1), user_id=1, 
-                status='available'
-            ),
-            Product(
-                name='Steering Wheel', description='Achieve comfy with the imported steering wheels', price_tag=3500.00, 
-                quantity=100, bidding_end_time=datetime(2024, 8, 10), user_id=1, 
-                status='available'
-            ),
-            Product(
-                name='Tyres', description='Lets go spanning with the new japan tyres', price_tag=4500.00,
-                quantity=70, bidding_end_time=datetime(2024, 8, 5), user_id=1, 
-                status='available'
-            ),
-        ]
-
-  
-        # Add products to the session
-        db.session.bulk_save_objects(products)
-        db.session.commit()
-
-        # Sample bids 
-        bids = [
-            Bid(user_id=2, product_id=1, amount=2300.00, status='accepted', bidding_time=datetime(2025, 8,5), highest_bid=3000), 
-            Bid(user_id=2, product_id=2, amount=3700.00, status='pending', bidding_time=datetime(2025, 9,5), highest_bid=4500),   
-            Bid(user_id=2, product_id=3, amount=4900.00, status='rejected', bidding_time=datetime(2025, 8,5), highest_bid=5000),  
-        ]
-
-        
-
-        # Add bids to the session
-        db.session.bulk_save_objects(bids)
-        db.session.commit()
+        with db.engine.connect() as conn:
+            for pragma in LOAD_PRAGMAS:
+                conn.exec_driver_sql(pragma)
+            conn.commit()
+
+            # Indexes are cheaper to build once than to maintain per insert.
+            # Sorted so they are rebuilt in the same order on every run
+            # (create_all makes them in set order).
+            indexes = sorted(
+                (index for table in db.metadata.sorted_tables for index in table.indexes),
+                key=lambda index: index.name
+            )
+            for index in indexes:
+                index.drop(conn)
+            conn.commit()
+
+            users = bulk_insert(conn, User.__table__, generate_users(rng, num_users))
+            # Sample users take ids 1 and 2, synthetic customers follow
+            admin_ids = [i + 1 for i, user in enumerate(SAMPLE_USERS) if user['role'] == 'admin']
+            customer_ids = [i + 1 for i, user in enumerate(SAMPLE_USERS) if user['role'] == 'customer']
+            customer_ids += list(range(len(SAMPLE_USERS) + 1, users + 1))
+
+            products = generate_products(rng, num_products, admin_ids, now)
+            counts = allocate_bids(rng, num_bids, num_products) if products else []
+            # Bids are generated first since closing an auction marks its product sold
+            bids = bulk_insert(conn, Bid.__table__, generate_bids(rng, products, counts, customer_ids, now))
+            bulk_insert(conn, Product.__table__, products)
+
+            for index in indexes:
+                index.create(conn)
+            conn.commit()
+
+            conn.exec_driver_sql('ANALYZE')
+            conn.commit()
+            # Rewrites the file from its contents, dropping the free pages left
+            # by the dropped indexes, so a rebuild is identical byte for byte
+            conn.exec_driver_sql('VACUUM')
+            for pragma in RESTORE_PRAGMAS:
+                conn.exec_driver_sql(pragma)
+            conn.commit()
+
+    return users, len(products), bids
+
 
 if __name__ == '__main__':
-    seed_data()
-    print("Database seeded!")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Seed the database with synthetic users, products and bids.')
+    parser.add_argument('--users', type=int, default=50, help='Number of synthetic customers')
+    parser.add_argument('--products', type=int, default=20, help='Number of products')
+    parser.add_argument('--bids', type=int, default=1000, help='Number of bids')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument(
+        '--anchor', type=parse_anchor, default='today',
+        help="Date auctions are laid out around (YYYY-MM-DD or 'today', the default). Auctions ending "
+             "after it are still open for bidding; pass a past date to rebuild an earlier database"
+    )
+    args = parser.parse_args()
+
+    users, products, bids = seed_data(args.users, args.products, args.bids, args.seed, args.anchor)
+    print(f"Database seeded! {users} users, {products} products, {bids} bids")
+    print(f"Rebuild it with --seed {args.seed} --anchor {args.anchor.date()}")
@@ -0,0 +1,4 @@
+import os
+
+# app.py reads the database URL at import time; keep tests off instance/app.db
+os.environ['DATABASE_URL'] = 'sqlite://'
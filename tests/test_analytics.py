@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+import analytics
+from analytics import product_analytics, user_analytics
+from app import app
+from models import db, User, Product, Bid
+
+
+@pytest.fixture
+def users():
+    analytics.clear_cache()
+    with app.app_context():
+        db.create_all()
+        created = {}
+        for username, role in [('scholar', 'admin'), ('johndoe', 'customer'), ('janedoe', 'customer')]:
+            user = User(username=username, email=f'{username}@example.com', role=role)
+            user.set_password('password123')
+            db.session.add(user)
+            created[username] = user
+        db.session.commit()
+        yield created
+        db.session.remove()
+        db.drop_all()
+    analytics.clear_cache()
+
+
+def add_product(owner, name, status='available', ends_in_days=-1):
+    product = Product(
+        name=name, description=name, price_tag=100.0, quantity=1, user_id=owner.id,
+        status=status, bidding_end_time=datetime.utcnow() + timedelta(days=ends_in_days)
+    )
+    db.session.add(product)
+    db.session.commit()
+    return product
+
+
+def add_bid(user, product, amount, minutes_ago=60):
+    bid = Bid(
+        user_id=user.id, product_id=product.id, amount=amount, highest_bid=amount,
+        bidding_time=datetime.utcnow() - timedelta(minutes=minutes_ago)
+    )
+    db.session.add(bid)
+    db.session.commit()
+    return bid
+
+
+def auth_header(user):
+    token = create_access_token(identity={'user_id': user.id, 'role': user.role})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_wins_go_to_the_earliest_of_tied_highest_bids(users):
+    john, jane = users['johndoe'], users['janedoe']
+    tied = add_product(users['scholar'], 'Gear Box', status='sold')
+    add_bid(jane, tied, 100.0, minutes_ago=30)
+    add_bid(john, tied, 100.0, minutes_ago=60)
+
+    # Closed but never marked sold: still a closed auction john took part in
+    unsold = add_product(users['scholar'], 'Tyres')
+    add_bid(john, unsold, 150.0)
+    add_bid(jane, unsold, 160.0)
+
+    # Still open, so not counted
+    live = add_product(users['scholar'], 'Radiator', ends_in_days=1)
+    add_bid(john, live, 200.0)
+
+    assert user_analytics(john)['wins'] == {'closed_auctions': 2, 'wins': 1, 'win_rate': 0.5}
+    assert user_analytics(jane)['wins'] == {'closed_auctions': 2, 'wins': 1, 'win_rate': 0.5}
+
+
+def test_bidder_concentration(users):
+    john, jane = users['johndoe'], users['janedoe']
+    product = add_product(users['scholar'], 'Headlights')
+    for amount in (110.0, 120.0, 130.0):
+        add_bid(john, product, amount)
+    add_bid(jane, product, 140.0)
+
+    concentration = product_analytics(product)['concentration']
+    assert concentration['hhi'] == pytest.approx((3 * 3 + 1 * 1) / 4 ** 2)
+    assert [(bidder['username'], bidder['share']) for bidder in concentration['top_bidders']] == [
+        ('johndoe', 0.75), ('janedoe', 0.25)
+    ]
+
+
+def test_bids_on_closed_auctions_are_refused(users):
+    john = users['johndoe']
+    ended = add_product(users['scholar'], 'Side Mirror')
+    sold = add_product(users['scholar'], 'Spark Plugs', status='sold', ends_in_days=1)
+    live = add_product(users['scholar'], 'Alternator', ends_in_days=1)
+
+    client = app.test_client()
+    for product in (ended, sold):
+        response = client.post('/bids', json={'product_id': product.id, 'amount': 120, 'highest_bid': 120},
+                               headers=auth_header(john))
+        assert response.status_code == 400
+
+    response = client.post('/bids', json={'product_id': live.id, 'amount': 120, 'highest_bid': 120},
+                           headers=auth_header(john))
+    assert response.status_code == 201
+    assert Bid.query.filter_by(product_id=live.id).count() == 1
+
+
+def test_cached_result_is_refreshed_by_a_new_bid(users):
+    product = add_product(users['scholar'], 'Brake Pads')
+    add_bid(users['johndoe'], product, 120.0)
+    assert product_analytics(product)['summary']['bid_count'] == 1
+
+    # Written around the API, which would refuse it
+    add_bid(users['janedoe'], product, 130.0)
+    assert product_analytics(product)['summary']['bid_count'] == 2
+
+
+def test_cached_result_is_refreshed_by_a_new_end_time(users):
+    product = add_product(users['scholar'], 'Steering Wheel')
+    bid = add_bid(users['johndoe'], product, 120.0)
+    assert product_analytics(product)['summary']['max_amount'] == 120.0
+
+    bid.amount = 150.0
+    product.bidding_end_time -= timedelta(hours=1)
+    db.session.commit()
+    assert product_analytics(product)['summary']['max_amount'] == 150.0
+
+
+def test_product_name_is_not_cached(users):
+    product = add_product(users['scholar'], 'Gear Box')
+    add_bid(users['johndoe'], product, 120.0)
+    product_analytics(product)
+
+    product.name = 'Gear Box Mk II'
+    db.session.commit()
+    assert product_analytics(product)['product_name'] == 'Gear Box Mk II'
+
+
+def test_cache_is_bounded_by_price_curve_rows(users, monkeypatch):
+    monkeypatch.setattr(analytics, 'CLOSED_CACHE_MAX_ROWS', 3)
+    first = add_product(users['scholar'], 'Tyres')
+    second = add_product(users['scholar'], 'Radiator')
+    for product in (first, second):
+        add_bid(users['johndoe'], product, 110.0, minutes_ago=30)
+        add_bid(users['johndoe'], product, 120.0, minutes_ago=90)
+
+    # Two hourly buckets each, so caching the second evicts the first
+    product_analytics(first)
+    product_analytics(second)
+    assert len(analytics._closed_product_cache) == 1
+    assert analytics._closed_product_cache_rows == 2
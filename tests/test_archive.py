@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app import app
+from models import db, User, Product, Bid, ArchivedProduct, ArchivedBid
+from archive import archive_settled_auctions
+
+
+@pytest.fixture
+def admin():
+    with app.app_context():
+        db.create_all()
+        user = User(username='scholar', email='scholar@example.com', role='admin')
+        user.set_password('scholarpass')
+        db.session.add(user)
+        db.session.commit()
+        yield user
+        db.session.remove()
+        db.drop_all()
+
+
+def add_product(user, name, status='available', ended_days_ago=0):
+    product = Product(
+        name=name, description=name, price_tag=100.0, quantity=1, user_id=user.id,
+        status=status, bidding_end_time=datetime.utcnow() - timedelta(days=ended_days_ago)
+    )
+    db.session.add(product)
+    db.session.commit()
+    bid = Bid(user_id=user.id, product_id=product.id, amount=120.0, highest_bid=120.0)
+    db.session.add(bid)
+    db.session.commit()
+    # Plain ids, since the rows may be archived (deleted) before they are read
+    return product.id, bid.id
+
+
+def test_archived_ids_are_not_reused(admin):
+    add_product(admin, 'Gear Box', status='sold', ended_days_ago=30)
+    product_id, bid_id = add_product(admin, 'Tyres', status='sold', ended_days_ago=30)
+
+    # The max-id product and bid are the ones moved out of the live tables
+    assert archive_settled_auctions(pause=0) == 2
+    assert Product.query.count() == 0
+    assert db.session.get(ArchivedProduct, product_id) is not None
+
+    new_product_id, new_bid_id = add_product(admin, 'Radiator', status='sold', ended_days_ago=30)
+    assert new_product_id > product_id
+    assert new_bid_id > bid_id
+
+    # Archiving again must not collide with the ids already in the archive
+    assert archive_settled_auctions(pause=0) == 1
+    assert ArchivedProduct.query.count() == 3
+    assert ArchivedBid.query.count() == 3
+
+
+def test_only_settled_auctions_are_archived(admin):
+    live_id, _ = add_product(admin, 'Headlights', ended_days_ago=-1)
+    add_product(admin, 'Side Mirror', ended_days_ago=30)
+
+    assert archive_settled_auctions(pause=0) == 1
+    assert [product.id for product in Product.query.all()] == [live_id]
+
+
+def test_sold_auctions_wait_out_the_grace_period(admin):
+    # Bids on a just-sold product may still need settling on the live rows
+    sold_id, bid_id = add_product(admin, 'Alternator', status='sold', ended_days_ago=1)
+
+    assert archive_settled_auctions(pause=0) == 0
+    assert db.session.get(Product, sold_id) is not None
+    assert db.session.get(Bid, bid_id) is not None
+
+
+def test_bids_are_moved_in_bounded_batches(admin, monkeypatch):
+    product_id, _ = add_product(admin, 'Exhaust Pipe', status='sold', ended_days_ago=30)
+    for amount in (130.0, 140.0, 150.0, 160.0):
+        db.session.add(Bid(user_id=admin.id, product_id=product_id, amount=amount, highest_bid=amount))
+    db.session.commit()
+
+    pauses = []
+    monkeypatch.setattr('archive.time.sleep', pauses.append)
+
+    assert archive_settled_auctions(pause=0.5, bid_batch_size=2) == 1
+    # Three bid batches of at most two bids, then the product batch itself
+    assert len(pauses) == 4
+    assert Bid.query.count() == 0
+    assert ArchivedBid.query.filter_by(product_id=product_id).count() == 5
+    assert db.session.get(ArchivedProduct, product_id).status == 'sold'
+
+
+def test_list_endpoints_page_live_and_archived_rows_together(admin):
+    archived_id, archived_bid_id = add_product(admin, 'Gear Box', status='sold', ended_days_ago=30)
+    archive_settled_auctions(pause=0)
+    live_id, live_bid_id = add_product(admin, 'Tyres', ended_days_ago=-1)
+
+    customer = User(username='johndoe', email='johndoe@example.com', role='customer')
+    customer.set_password('password123')
+    db.session.add(customer)
+    db.session.commit()
+    token = create_access_token(identity={'user_id': customer.id, 'role': customer.role})
+    headers = {'Authorization': f'Bearer {token}'}
+    client = app.test_client()
+
+    for path, expected in [('/bids', [archived_bid_id, live_bid_id]), ('/products', [archived_id, live_id])]:
+        first = client.get(f'{path}?include_archived=true&limit=1', headers=headers)
+        assert [row['id'] for row in first.get_json()] == expected[:1]
+        cursor = first.headers['X-Next-After-Id']
+
+        second = client.get(f'{path}?include_archived=true&limit=1&after_id={cursor}', headers=headers)
+        assert [row['id'] for row in second.get_json()] == expected[1:]
+
+        last = client.get(f'{path}?include_archived=true&limit=1&after_id={expected[1]}', headers=headers)
+        assert last.get_json() == []
+        assert 'X-Next-After-Id' not in last.headers
+
+    response = client.get('/bids?include_archived=true&limit=0', headers=headers)
+    assert response.status_code == 400
+    assert response.get_json() == {'message': 'limit must be between 1 and 1000'}
@@ -0,0 +1,74 @@
+import random
+from collections import Counter
+from datetime import datetime
+import pytest
+from app import app
+from models import db, User, Product, Bid
+from seed import allocate_bids, generate_bids, generate_products, seed_data
+
+ANCHOR = datetime(2025, 1, 1)
+
+
+def generate(seed, num_products=30, num_bids=3000):
+    rng = random.Random(seed)
+    products = generate_products(rng, num_products, [2], ANCHOR)
+    counts = allocate_bids(rng, num_bids, num_products)
+    bids = list(generate_bids(rng, products, counts, list(range(3, 103)), ANCHOR))
+    return products, bids
+
+
+def test_same_seed_generates_the_same_rows():
+    assert generate(7) == generate(7)
+    assert generate(7) != generate(8)
+
+
+def test_sold_products_have_exactly_one_accepted_bid():
+    products, bids = generate(7)
+    accepted = Counter(bid['product_id'] for bid in bids if bid['status'] == 'accepted')
+    with_bids = {bid['product_id'] for bid in bids}
+
+    for product in products:
+        if product['status'] == 'sold':
+            assert accepted[product['id']] == 1
+            assert product['bidding_end_time'] <= ANCHOR
+        else:
+            assert accepted[product['id']] == 0
+            assert product['bidding_end_time'] > ANCHOR or product['id'] not in with_bids
+
+
+def test_highest_bid_is_never_below_the_bid():
+    products, bids = generate(7)
+    assert len(bids) == 3000
+    for bid in bids:
+        assert bid['highest_bid'] >= bid['amount']
+        assert bid['bidding_time'] <= ANCHOR
+
+
+@pytest.fixture
+def seeded():
+    counts = seed_data(num_users=10, num_products=5, num_bids=200, seed=3, anchor=ANCHOR)
+    with app.app_context():
+        yield counts
+        db.session.remove()
+        db.drop_all()
+
+
+def test_seed_data_loads_the_database(seeded):
+    users, products, bids = seeded
+    assert (users, products, bids) == (12, 5, 200)
+    assert User.query.count() == 12
+    assert Product.query.count() == 5
+    assert Bid.query.count() == 200
+    assert User.query.filter_by(username='johndoe').first().check_password('password123')
+
+
+def test_seed_data_rebuilds_the_same_database():
+    tables = [User.__table__, Product.__table__, Bid.__table__]
+    dumps = []
+    for _ in range(2):
+        seed_data(num_users=10, num_products=5, num_bids=200, seed=3, anchor=ANCHOR)
+        with app.app_context():
+            dumps.append([db.session.execute(table.select().order_by(table.c.id)).all() for table in tables])
+            db.session.remove()
+            db.drop_all()
+    assert dumps[0] == dumps[1]